@@ -2,21 +2,27 @@
 import json
 import logging
 import os
-from datetime import datetime, timedelta
 from typing import Any
 
 import numpy as np
-import yfinance as yf
 from fastapi import APIRouter, HTTPException, Query
 from scipy.stats import norm  # At the top of your file
 
-from app.models import Objective, QuestionnaireResponse
+from app.core.config import settings
+from app.models import Objective, PortfolioRiskRequest, QuestionnaireResponse
 from app.utils import (
+    DEFAULT_SURFACE_CONFIDENCE_LEVELS,
+    DEFAULT_SURFACE_HORIZONS,
+    cached_result,
     calculate_risk_score,
+    compute_risk_surface,
     determine_investment_term,
+    evaluate_portfolio_risk,
+    get_market_data,
     map_score_to_risk_level,
     optimize_portfolio_assets,
     optimize_portfolio_with_risk_level,
+    optimize_sparse_portfolio,
 )
 
 router = APIRouter()
@@ -30,6 +36,51 @@ logging.basicConfig(level=logging.INFO)
 TICKERS = json.loads(os.getenv('TICKERS'))
 
 
+def _risk_surface_grid(
+    risk_surface: bool,
+    confidence_levels: list[float] | None,
+    horizons: list[int] | None,
+) -> tuple[list[float] | None, list[int] | None]:
+    # Resolve the requested surface grid, or (None, None) when not requested
+    if not risk_surface:
+        return None, None
+    confidence_levels = confidence_levels or DEFAULT_SURFACE_CONFIDENCE_LEVELS
+    horizons = horizons or DEFAULT_SURFACE_HORIZONS
+    if any(not 0 < level < 1 for level in confidence_levels):
+        raise HTTPException(
+            status_code=400, detail="Confidence levels must be between 0 and 1."
+        )
+    if any(horizon <= 0 for horizon in horizons):
+        raise HTTPException(
+            status_code=400, detail="Horizons must be positive numbers of days."
+        )
+    return confidence_levels, horizons
+
+
+def _format_risk_surface(
+    portfolio_returns,
+    daily_expected_return: float,
+    daily_expected_risk: float,
+    confidence_levels: list[float],
+    horizons: list[int],
+) -> dict[str, Any]:
+    surface = compute_risk_surface(
+        portfolio_returns,
+        daily_expected_return,
+        daily_expected_risk,
+        confidence_levels,
+        horizons,
+    )
+    return {
+        "confidence_levels": confidence_levels,
+        "horizons": horizons,
+        **{
+            name: np.round(values * 100, 2).tolist()
+            for name, values in surface.items()
+        },
+    }
+
+
 @router.post("/questionnaire")
 def process_questionnaire(response: QuestionnaireResponse):
     """
@@ -70,7 +121,17 @@ def optimize_given_portfolio(
         le=0.99,
         description="Confidence level for VaR (e.g., 0.95 for 95%)",
     ),
-    
+    risk_surface: bool = Query(
+        False,
+        description="Also return VaR and expected shortfall for a grid of "
+        "confidence levels x horizons",
+    ),
+    surface_confidence_levels: list[float] | None = Query(
+        None, description="Confidence levels for the risk surface (default 0.90-0.99)"
+    ),
+    surface_horizons: list[int] | None = Query(
+        None, description="Horizons in trading days for the risk surface (default 1, 5, 21, 252)"
+    ),
 ) -> Any:
     """
     Optimize portfolio based on the specified objective.
@@ -87,33 +148,12 @@ def optimize_given_portfolio(
       - yearly_var (float): Yearly VaR in percentage.
     - historical_data (dict): Historical data and change information for each ticker.
     - confidence_level (float): The confidence level used for VaR calculation.
+    - risk_surface (dict, if requested): Parametric VaR, historical VaR and
+      expected shortfall in percentage, as confidence levels x horizons grids.
     """
- 
-
-    # Determine the start date based on investment term
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=investment_term)
-
-    # Fetch historical price data
-    data = yf.download(
-        TICKERS,
-        start=start_date.strftime("%Y-%m-%d"),
-        end=end_date.strftime("%Y-%m-%d"),
-    )["Adj Close"]
-
-    # Check if data was fetched successfully
-    if data.empty:
-        raise HTTPException(
-            status_code=400, detail="No data fetched for the given investment term."
-        )
-
-    # Calculate daily returns
-    returns = data.pct_change().dropna()
-
-    # Calculate expected returns and covariance matrix
-    expected_returns = returns.mean()
-    covariance_matrix = returns.cov()
-
+    surface_levels, surface_horizons = _risk_surface_grid(
+        risk_surface, surface_confidence_levels, surface_horizons
+    )
     if target_return is None and risk_limit is None:
         raise HTTPException(
             status_code=400,
@@ -125,7 +165,42 @@ def optimize_given_portfolio(
             status_code=400,
             detail="Only one of target return or risk limit can be provided.",
         )
-    
+
+    return cached_result(
+        "calculator",
+        {
+            "investment_term": investment_term,
+            "target_return": target_return,
+            "risk_limit": risk_limit,
+            "confidence_level": confidence_level,
+            "surface_confidence_levels": surface_levels,
+            "surface_horizons": surface_horizons,
+        },
+        lambda: _optimize_given_portfolio(
+            investment_term,
+            target_return,
+            risk_limit,
+            confidence_level,
+            surface_levels,
+            surface_horizons,
+        ),
+        deadline=settings.CALCULATOR_DEADLINE_SECONDS,
+    )
+
+
+def _optimize_given_portfolio(
+    investment_term: int,
+    target_return: float | None,
+    risk_limit: float | None,
+    confidence_level: float,
+    surface_levels: list[float] | None = None,
+    surface_horizons: list[int] | None = None,
+) -> dict[str, Any]:
+    # Fetch historical price data, daily returns and their statistics
+    data, returns, expected_returns, covariance_matrix = get_market_data(
+        investment_term
+    )
+
     if target_return is not None:
         objective = "min_risk_with_return"
     else:
@@ -134,7 +209,7 @@ def optimize_given_portfolio(
 
     # Perform portfolio optimization
     try:
-        allocation,result = optimize_portfolio_assets(
+        allocation, result, solve_info = optimize_portfolio_assets(
             expected_returns,
             covariance_matrix,
             objective,
@@ -224,10 +299,7 @@ def optimize_given_portfolio(
     if risk_limit is None:
         risk_limit = result
 
-    return {
-        "risk_level": risk_limit,
-        "investment_term": investment_term // 365,
-        "portfolio": {
+    portfolio = {
         "objective": objective,
         "investment_term_days": investment_term,
         "allocation": allocation_percentages,
@@ -236,6 +308,7 @@ def optimize_given_portfolio(
         "expected_annual_return": round(expected_portfolio_return * 100, 2),
         "expected_annual_risk": round(expected_portfolio_risk * 100, 2),
         "confidence_level": confidence_level,
+        "solver": solve_info,
         "value_at_risk": {
             "daily_var": round(daily_var * 100, 2),
             "weekly_var": round(weekly_var * 100, 2),
@@ -243,7 +316,102 @@ def optimize_given_portfolio(
         },
         "historical_data": historical_data,
         "correlation_matrix": correlation_matrix.to_dict(),
-        }
+    }
+    if surface_levels is not None:
+        portfolio["risk_surface"] = _format_risk_surface(
+            returns @ allocation,
+            daily_expected_return,
+            daily_expected_risk,
+            surface_levels,
+            surface_horizons,
+        )
+
+    return {
+        "risk_level": risk_limit,
+        "investment_term": investment_term // 365,
+        "portfolio": portfolio,
+    }
+
+
+@router.post("/risk")
+def analyze_portfolio_risk(request: PortfolioRiskRequest) -> Any:
+    """
+    Evaluate one or more portfolios the user already holds, without
+    re-optimizing.
+
+    Returns, for each row of `weights`:
+    - allocation (dict): Asset allocation percentages.
+    - expected_daily_return / expected_daily_risk (float): In percentage.
+    - expected_annual_return / expected_annual_risk (float): In percentage.
+    - value_at_risk (dict): Daily parametric and historical VaR in percentage,
+      keyed by confidence level.
+    - marginal_risk_contribution (dict): d(daily risk)/d(weight) per ticker.
+    - component_risk_contribution (dict): Each ticker's share of daily risk in
+      percentage; the values add up to expected_daily_risk.
+    """
+    if not request.weights or any(len(row) != len(TICKERS) for row in request.weights):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Each weight vector must have {len(TICKERS)} entries, one per ticker.",
+        )
+
+    # Cached returns and covariance; every portfolio is evaluated in one pass
+    _, returns, expected_returns, covariance_matrix = get_market_data(
+        request.investment_term
+    )
+    metrics = evaluate_portfolio_risk(
+        request.weights,
+        expected_returns,
+        covariance_matrix,
+        returns,
+        request.confidence_levels,
+    )
+
+    trading_days_per_year = 252  # Approximate number of trading days in a year
+    portfolios = []
+    for i, allocation in enumerate(request.weights):
+        daily_expected_return = float(metrics["expected_return"][i])
+        daily_expected_risk = float(metrics["risk"][i])
+        portfolios.append(
+            {
+                "allocation": {
+                    ticker: round(weight * 100, 2)
+                    for ticker, weight in zip(TICKERS, allocation)
+                },
+                "expected_daily_return": round(daily_expected_return * 100, 2),
+                "expected_daily_risk": round(daily_expected_risk * 100, 2),
+                "expected_annual_return": round(
+                    daily_expected_return * trading_days_per_year * 100, 2
+                ),
+                "expected_annual_risk": round(
+                    daily_expected_risk * np.sqrt(trading_days_per_year) * 100, 2
+                ),
+                "value_at_risk": {
+                    str(level): {
+                        "parametric_var": round(float(parametric) * 100, 2),
+                        "historical_var": round(float(historical) * 100, 2),
+                    }
+                    for level, parametric, historical in zip(
+                        request.confidence_levels,
+                        metrics["parametric_var"][i],
+                        metrics["historical_var"][i],
+                    )
+                },
+                "marginal_risk_contribution": {
+                    ticker: round(float(value), 4)
+                    for ticker, value in zip(TICKERS, metrics["marginal_risk"][i])
+                },
+                "component_risk_contribution": {
+                    ticker: round(float(value) * 100, 4)
+                    for ticker, value in zip(TICKERS, metrics["component_risk"][i])
+                },
+            }
+        )
+
+    return {
+        "investment_term_days": request.investment_term,
+        "confidence_levels": request.confidence_levels,
+        "portfolios": portfolios,
     }
 
 
@@ -263,6 +431,23 @@ def optimize_portfolio(
         le=0.99,
         description="Confidence level for VaR (e.g., 0.95 for 95%)",
     ),
+    risk_surface: bool = Query(
+        False,
+        description="Also return VaR and expected shortfall for a grid of "
+        "confidence levels x horizons",
+    ),
+    surface_confidence_levels: list[float] | None = Query(
+        None, description="Confidence levels for the risk surface (default 0.90-0.99)"
+    ),
+    surface_horizons: list[int] | None = Query(
+        None, description="Horizons in trading days for the risk surface (default 1, 5, 21, 252)"
+    ),
+    max_holdings: int = Query(
+        None, gt=0, description="Maximum number of positions (sparse mode)"
+    ),
+    min_position: float = Query(
+        None, gt=0, le=1, description="Minimum size of each position, as decimal (sparse mode)"
+    ),
 ) -> Any:
     """
     Optimize portfolio based on the specified objective.
@@ -279,42 +464,80 @@ def optimize_portfolio(
       - yearly_var (float): Yearly VaR in percentage.
     - historical_data (dict): Historical data and change information for each ticker.
     - confidence_level (float): The confidence level used for VaR calculation.
+    - risk_surface (dict, if requested): Parametric VaR, historical VaR and
+      expected shortfall in percentage, as confidence levels x horizons grids.
+    - sparse (dict, if max_holdings or min_position is set): Holdings count and
+      the unconstrained optimum for comparison; allocation and the metrics
+      above then describe the sparse portfolio.
     """
- 
-
-    # Determine the start date based on investment term
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=investment_term)
-
-    # Fetch historical price data
-    data = yf.download(
-        TICKERS,
-        start=start_date.strftime("%Y-%m-%d"),
-        end=end_date.strftime("%Y-%m-%d"),
-    )["Adj Close"]
-
-    # Check if data was fetched successfully
-    if data.empty:
-        raise HTTPException(
-            status_code=400, detail="No data fetched for the given investment term."
-        )
+    surface_levels, surface_horizons = _risk_surface_grid(
+        risk_surface, surface_confidence_levels, surface_horizons
+    )
+    return cached_result(
+        "optimize",
+        {
+            "investment_term": investment_term,
+            "objective": objective,
+            "target_return": target_return,
+            "risk_limit": risk_limit,
+            "confidence_level": confidence_level,
+            "surface_confidence_levels": surface_levels,
+            "surface_horizons": surface_horizons,
+            "max_holdings": max_holdings,
+            "min_position": min_position,
+        },
+        lambda: _optimize_portfolio(
+            investment_term,
+            objective,
+            target_return,
+            risk_limit,
+            confidence_level,
+            surface_levels,
+            surface_horizons,
+            max_holdings,
+            min_position,
+        ),
+        deadline=settings.OPTIMIZE_DEADLINE_SECONDS,
+    )
 
-    # Calculate daily returns
-    returns = data.pct_change().dropna()
 
-    # Calculate expected returns and covariance matrix
-    expected_returns = returns.mean()
-    covariance_matrix = returns.cov()
+def _optimize_portfolio(
+    investment_term: int,
+    objective: Objective,
+    target_return: float | None,
+    risk_limit: float | None,
+    confidence_level: float,
+    surface_levels: list[float] | None = None,
+    surface_horizons: list[int] | None = None,
+    max_holdings: int | None = None,
+    min_position: float | None = None,
+) -> dict[str, Any]:
+    # Fetch historical price data, daily returns and their statistics
+    data, returns, expected_returns, covariance_matrix = get_market_data(
+        investment_term
+    )
 
     # Perform portfolio optimization
+    sparse = max_holdings is not None or min_position is not None
     try:
-        allocation = optimize_portfolio_assets(
-            expected_returns,
-            covariance_matrix,
-            objective,
-            target_return,
-            risk_limit,
-        )
+        if sparse:
+            allocation, _, solve_info, dense = optimize_sparse_portfolio(
+                expected_returns,
+                covariance_matrix,
+                objective,
+                target_return,
+                risk_limit,
+                max_holdings,
+                min_position,
+            )
+        else:
+            allocation, _, solve_info = optimize_portfolio_assets(
+                expected_returns,
+                covariance_matrix,
+                objective,
+                target_return,
+                risk_limit,
+            )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -394,7 +617,7 @@ def optimize_portfolio(
             }
 
     correlation_matrix = returns.corr()
-    return {
+    portfolio = {
         "objective": objective,
         "investment_term_days": investment_term,
         "allocation": allocation_percentages,
@@ -403,6 +626,7 @@ def optimize_portfolio(
         "expected_annual_return": round(expected_portfolio_return * 100, 2),
         "expected_annual_risk": round(expected_portfolio_risk * 100, 2),
         "confidence_level": confidence_level,
+        "solver": solve_info,
         "value_at_risk": {
             "daily_var": round(daily_var * 100, 2),
             "weekly_var": round(weekly_var * 100, 2),
@@ -411,3 +635,43 @@ def optimize_portfolio(
         "historical_data": historical_data,
         "correlation_matrix": correlation_matrix.to_dict(),
     }
+    if surface_levels is not None:
+        portfolio["risk_surface"] = _format_risk_surface(
+            returns @ allocation,
+            daily_expected_return,
+            daily_expected_risk,
+            surface_levels,
+            surface_horizons,
+        )
+    if sparse:
+        dense_allocation, _, dense_solve_info = dense
+        portfolio["sparse"] = {
+            "max_holdings": max_holdings,
+            "min_position": min_position,
+            "holdings": int(np.sum(allocation > 1e-4)),
+            "unconstrained": {
+                "allocation": {
+                    ticker: round(weight * 100, 2)
+                    for ticker, weight in zip(TICKERS, dense_allocation)
+                },
+                "holdings": int(np.sum(dense_allocation > 1e-4)),
+                "expected_annual_return": round(
+                    float(expected_returns.values @ dense_allocation)
+                    * trading_days_per_year
+                    * 100,
+                    2,
+                ),
+                "expected_annual_risk": round(
+                    float(
+                        np.sqrt(
+                            dense_allocation @ covariance_matrix.values @ dense_allocation
+                        )
+                    )
+                    * np.sqrt(trading_days_per_year)
+                    * 100,
+                    2,
+                ),
+                "solver": dense_solve_info,
+            },
+        }
+    return portfolio
@@ -45,6 +45,32 @@ class Settings(BaseSettings):
     PROJECT_NAME: str
     SENTRY_DSN: HttpUrl | None = None
 
+    # Durable store for optimization results (SQLite, WAL mode)
+    RESULT_STORE_PATH: str = "data/results.sqlite3"
+    RESULT_STORE_KEEP_SNAPSHOTS: int = 2
+
+    # Per-endpoint latency budgets (seconds) covering data fetch and solve.
+    # Past the deadline the latest stored result for the same parameters is
+    # returned flagged as stale while the computation finishes in the
+    # background. None disables the deadline.
+    QUESTIONNAIRE_DEADLINE_SECONDS: float | None = 10.0
+    CALCULATOR_DEADLINE_SECONDS: float | None = 10.0
+    OPTIMIZE_DEADLINE_SECONDS: float | None = 10.0
+    # Threads computing results under a deadline. Sized like FastAPI's request
+    # threadpool (40), so misses are not queued behind a smaller pool with
+    # the queueing time counted against the deadline.
+    RESULT_WORKERS: int = 40
+
+    # cvxpy solver policy: candidates in preference order, benchmarked per
+    # objective when SOLVER_AUTOTUNE is set. Tolerances default to each
+    # solver's own; SOLVER_OPTIONS adds raw keyword arguments per solver.
+    SOLVER_CANDIDATES: list[str] = ["CLARABEL", "OSQP", "ECOS", "SCS"]
+    SOLVER_AUTOTUNE: bool = True
+    SOLVER_ACCURACY: float = 1e-4
+    SOLVER_ABS_TOLERANCE: float | None = None
+    SOLVER_REL_TOLERANCE: float | None = None
+    SOLVER_OPTIONS: dict[str, dict[str, Any]] = {}
+
 
 
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
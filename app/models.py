@@ -1,5 +1,7 @@
 from enum import Enum
-from pydantic import BaseModel
+from typing import Annotated
+
+from pydantic import BaseModel, Field
 
 class Objective(str, Enum):
     max_return = "max_return"
@@ -7,6 +9,9 @@ class Objective(str, Enum):
     max_sharpe = "max_sharpe"
     max_return_with_risk = "max_return_with_risk"
     min_risk_with_return = "min_risk_with_return"
+    hierarchical_risk_parity = "hierarchical_risk_parity"
+    inverse_volatility = "inverse_volatility"
+    equal_risk_contribution = "equal_risk_contribution"
 
 
 class AgeGroup(str, Enum):
@@ -39,3 +44,9 @@ class QuestionnaireResponse(BaseModel):
     loss_reaction: LossReaction
     investment_horizon: InvestmentHorizon
 
+
+class PortfolioRiskRequest(BaseModel):
+    investment_term: int = Field(..., gt=0, description="Investment term in days")
+    # One row per portfolio, columns in TICKERS order, as decimals
+    weights: list[list[float]]
+    confidence_levels: list[Annotated[float, Field(gt=0, lt=1)]] = [0.90, 0.95, 0.99]
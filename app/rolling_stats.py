@@ -0,0 +1,138 @@
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class RollingMoments:
+    """
+    Count, mean and co-moment matrix sum((x - mean)(x - mean)') of a set of
+    observations, maintained as rows enter and leave the window.
+
+    Rows are merged and removed with the pairwise (Chan et al.) form of
+    Welford's update, so a batch of k rows costs O(k * N^2) instead of the
+    O(T * N^2) of recomputing the covariance over the whole window.
+    """
+
+    def __init__(self, n_features: int):
+        self.count = 0
+        self.mean = np.zeros(n_features)
+        self.comoment = np.zeros((n_features, n_features))
+
+    @classmethod
+    def from_array(cls, rows: np.ndarray) -> "RollingMoments":
+        moments = cls(rows.shape[1])
+        moments.add(rows)
+        return moments
+
+    def add(self, rows: np.ndarray) -> None:
+        rows = np.atleast_2d(rows)
+        if not len(rows):
+            return
+        batch_count = len(rows)
+        batch_mean = rows.mean(axis=0)
+        centered = rows - batch_mean
+
+        total = self.count + batch_count
+        delta = batch_mean - self.mean
+        self.comoment += centered.T @ centered + np.outer(delta, delta) * (
+            self.count * batch_count / total
+        )
+        self.mean += delta * (batch_count / total)
+        self.count = total
+
+    def remove(self, rows: np.ndarray) -> None:
+        rows = np.atleast_2d(rows)
+        if not len(rows):
+            return
+        batch_count = len(rows)
+        remaining = self.count - batch_count
+        if remaining <= 0:
+            self.count = 0
+            self.mean = np.zeros_like(self.mean)
+            self.comoment = np.zeros_like(self.comoment)
+            return
+        batch_mean = rows.mean(axis=0)
+        centered = rows - batch_mean
+
+        remaining_mean = (self.count * self.mean - batch_count * batch_mean) / remaining
+        delta = batch_mean - remaining_mean
+        self.comoment -= centered.T @ centered + np.outer(delta, delta) * (
+            remaining * batch_count / self.count
+        )
+        self.mean = remaining_mean
+        self.count = remaining
+
+    def covariance(self) -> np.ndarray:
+        # Sample covariance (ddof=1), symmetrized against rounding drift
+        covariance = self.comoment / (self.count - 1)
+        return (covariance + covariance.T) / 2
+
+
+class IncrementalStatistics:
+    """
+    Expected returns and covariance per rolling window (e.g. per investment
+    term), updated from the previous window as trading days arrive and
+    expire. Falls back to a full recompute when the new window is not a
+    shifted version of the previous one (different tickers, revised history,
+    or a shift larger than half the window). At most `maxsize` windows are
+    tracked; the least recently updated one is evicted first.
+    """
+
+    def __init__(self, maxsize: int = 16):
+        self.maxsize = maxsize
+        self._windows: OrderedDict[object, tuple[pd.DataFrame, RollingMoments]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def update(self, window, returns: pd.DataFrame) -> tuple[pd.Series, pd.DataFrame]:
+        with self._lock:
+            moments = self._advance(window, returns)
+            self._windows[window] = (returns, moments)
+            self._windows.move_to_end(window)
+            while len(self._windows) > self.maxsize:
+                self._windows.popitem(last=False)
+
+            expected_returns = pd.Series(moments.mean.copy(), index=returns.columns)
+            covariance_matrix = pd.DataFrame(
+                moments.covariance(), index=returns.columns, columns=returns.columns
+            )
+        return expected_returns, covariance_matrix
+
+    def _advance(self, window, returns: pd.DataFrame) -> RollingMoments:
+        previous = self._windows.get(window)
+        if previous is None:
+            return RollingMoments.from_array(returns.values)
+
+        previous_returns, moments = previous
+        if (
+            returns.empty
+            or previous_returns.empty
+            or not previous_returns.columns.equals(returns.columns)
+        ):
+            return RollingMoments.from_array(returns.values)
+
+        # Rows before the new window start expire; rows after the old end arrive
+        n_expired = previous_returns.index.searchsorted(returns.index[0])
+        n_overlap = returns.index.searchsorted(previous_returns.index[-1], side="right")
+        kept = previous_returns.values[n_expired:]
+        overlap = returns.values[:n_overlap]
+
+        # The overlap must be unchanged for the update to be exact
+        shifted = n_expired + len(returns) - n_overlap
+        if (
+            shifted > len(returns) // 2
+            or not previous_returns.index[n_expired:].equals(returns.index[:n_overlap])
+            or not np.array_equal(overlap, kept)
+        ):
+            logger.info("Recomputing statistics for window %s", window)
+            return RollingMoments.from_array(returns.values)
+
+        moments.remove(previous_returns.values[:n_expired])
+        moments.add(returns.values[n_overlap:])
+        return moments
@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+import cvxpy as cp
+import numpy as np
+
+from app.core.config import settings
+from app.models import Objective
+
+logger = logging.getLogger(__name__)
+
+# Keyword names each solver uses for absolute / relative / feasibility tolerances
+TOLERANCE_OPTIONS = {
+    "CLARABEL": ("tol_gap_abs", "tol_gap_rel", "tol_feas"),
+    "OSQP": ("eps_abs", "eps_rel", None),
+    "ECOS": ("abstol", "reltol", "feastol"),
+    "SCS": ("eps_abs", "eps_rel", None),
+}
+
+
+def solver_options(solver: str) -> dict[str, Any]:
+    """Solver keyword arguments built from the tolerance settings."""
+    absolute, relative, feasibility = TOLERANCE_OPTIONS.get(solver, (None, None, None))
+    options: dict[str, Any] = {}
+    if settings.SOLVER_ABS_TOLERANCE is not None:
+        for name in (absolute, feasibility):
+            if name:
+                options[name] = settings.SOLVER_ABS_TOLERANCE
+    if settings.SOLVER_REL_TOLERANCE is not None and relative:
+        options[relative] = settings.SOLVER_REL_TOLERANCE
+    options.update(settings.SOLVER_OPTIONS.get(solver, {}))
+    return options
+
+
+class SolverPolicy:
+    """
+    Chooses the cvxpy solver per optimization objective.
+
+    With autotuning enabled, the first solve for an objective starts a
+    background benchmark of every installed candidate on a synthetic problem of
+    the same class and size, ranking those that reach the reference optimum
+    (within `accuracy`) by solve time. Until the ranking is ready, solves use
+    the candidates in their configured order. Solves try the solvers in order,
+    falling back to the next one on a solver error or a non-optimal status.
+    """
+
+    def __init__(
+        self,
+        benchmark_problem: Callable[[Objective], tuple[cp.Problem, cp.Variable]],
+        candidates: list[str],
+        autotune: bool = True,
+        accuracy: float = 1e-4,
+        repeats: int = 3,
+    ):
+        self.benchmark_problem = benchmark_problem
+        installed = set(cp.installed_solvers())
+        self.candidates = [solver for solver in candidates if solver in installed]
+        self.autotune = autotune
+        self.accuracy = accuracy
+        self.repeats = repeats
+        self._rankings: dict[Objective, list[str]] = {}
+        self._benchmarking: set[Objective] = set()
+        self._lock = threading.Lock()
+
+    def ranking(self, objective: Objective) -> list[str]:
+        if not self.autotune:
+            return self.candidates
+        with self._lock:
+            ranked = self._rankings.get(objective)
+            if ranked is None and objective not in self._benchmarking:
+                # Benchmark off the request path; it never counts against a deadline.
+                # Not a daemon: killing it inside a native solver aborts the process.
+                self._benchmarking.add(objective)
+                threading.Thread(
+                    target=self._rank,
+                    args=(objective,),
+                    name=f"solver-benchmark-{objective.value}",
+                    daemon=False,
+                ).start()
+        return ranked or self.candidates
+
+    def _rank(self, objective: Objective) -> None:
+        try:
+            ranked = self.benchmark(objective)
+        except Exception:
+            logger.exception("Solver benchmark for %s failed", objective.value)
+            ranked = self.candidates
+        with self._lock:
+            self._rankings[objective] = ranked
+            self._benchmarking.discard(objective)
+
+    def benchmark(self, objective: Objective) -> list[str]:
+        results = []
+        for solver in self.candidates:
+            timings = []
+            try:
+                # A fresh problem per run, so canonicalization is timed as well
+                for _ in range(self.repeats):
+                    problem, _ = self.benchmark_problem(objective)
+                    started = time.perf_counter()
+                    problem.solve(solver=solver, **solver_options(solver))
+                    timings.append(time.perf_counter() - started)
+            except cp.SolverError:
+                continue
+            if problem.status not in ["optimal", "optimal_inaccurate"]:
+                continue
+            violation = max(
+                float(np.max(constraint.violation())) for constraint in problem.constraints
+            )
+            results.append((solver, min(timings), problem.status, problem.value, violation))
+
+        if not results:
+            return self.candidates
+
+        # Reference optimum from the tightest solution that solved to optimality
+        exact = [result for result in results if result[2] == "optimal"] or results
+        reference = min(exact, key=lambda result: result[4])[3]
+        tolerance = self.accuracy * max(1.0, abs(reference))
+
+        accurate = [
+            result
+            for result in results
+            if result[2] == "optimal"
+            and abs(result[3] - reference) <= tolerance
+            and result[4] <= self.accuracy
+        ]
+        ranked = [result[0] for result in sorted(accurate, key=lambda result: result[1])]
+        # Less accurate solvers stay available as a last resort
+        ranked += [result[0] for result in results if result[0] not in ranked]
+
+        timings = {result[0]: result[1] for result in results}
+        logger.info(
+            "Solver ranking for %s: %s",
+            objective.value,
+            ", ".join(f"{solver} ({timings[solver] * 1000:.1f} ms)" for solver in ranked),
+        )
+        return ranked
+
+    def solve(
+        self, problem: cp.Problem, objective: Objective, warm_start: bool = False
+    ) -> dict[str, Any]:
+        """
+        Solve `problem` with the ranked solvers for `objective`. Returns a record
+        of the solver used, its status, the wall-clock time across all attempts
+        and the solvers attempted; raises ValueError if no solver reaches an
+        optimal status. With `warm_start`, solvers that support it start from
+        their previous solve of the same problem object (typically re-solved
+        after changing parameter values).
+        """
+        attempts = []
+        inaccurate = None
+        status = None
+        started = time.perf_counter()
+        for solver in self.ranking(objective):
+            attempts.append(solver)
+            try:
+                problem.solve(
+                    solver=solver, warm_start=warm_start, **solver_options(solver)
+                )
+            except cp.SolverError as e:
+                logger.warning("Solver %s failed: %s", solver, e)
+                continue
+            status = problem.status
+            if status == "optimal":
+                return self._record(solver, status, started, attempts)
+            # Accurate infeasible/unbounded certificates won't change with the solver
+            if status in ["infeasible", "unbounded"]:
+                break
+            if status == "optimal_inaccurate" and inaccurate is None:
+                inaccurate = (solver, problem.solution)
+            logger.warning("Solver %s returned %s, trying next candidate", solver, status)
+
+        # Nothing solved accurately; restore the first inaccurate solution
+        if inaccurate is not None:
+            solver, solution = inaccurate
+            problem.unpack(solution)
+            return self._record(solver, problem.status, started, attempts)
+
+        raise ValueError(f"Optimization failed. Status: {status}")
+
+    @staticmethod
+    def _record(solver: str, status: str, started: float, attempts: list[str]):
+        elapsed = time.perf_counter() - started
+        logger.info("Solved with %s (%s) in %.1f ms", solver, status, elapsed * 1000)
+        return {
+            "solver": solver,
+            "status": status,
+            "solve_time_ms": round(elapsed * 1000, 2),
+            "attempts": attempts,
+        }
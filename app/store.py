@@ -0,0 +1,159 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any
+
+import numpy as np
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _to_json_value(value: Any) -> Any:
+    # Numpy scalars/arrays and enums as produced by the optimization code
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, np.generic | np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def make_result_key(kind: str, params: dict[str, Any]) -> str:
+    """
+    Normalize request parameters into a stable key: enums by value, floats
+    rounded so that 0.1 and 0.10000000000000001 match, keys sorted.
+    """
+    normalized = {}
+    for name, value in params.items():
+        if isinstance(value, Enum):
+            value = value.value
+        elif isinstance(value, float | np.floating):
+            value = round(float(value), 10)
+        normalized[name] = value
+    return json.dumps({"kind": kind, **normalized}, sort_keys=True, default=_to_json_value)
+
+
+class ResultStore(ABC):
+    """
+    Durable store for computed results, keyed by normalized parameters and
+    the version of the market data snapshot they were computed from.
+    """
+
+    @abstractmethod
+    def get(self, key: str, snapshot: str) -> dict[str, Any] | None:
+        ...
+
+    @abstractmethod
+    def get_latest(self, key: str) -> tuple[str, dict[str, Any]] | None:
+        """Most recent (snapshot, result) stored for `key`, on any snapshot."""
+
+    @abstractmethod
+    def put(self, key: str, snapshot: str, result: dict[str, Any]) -> None:
+        ...
+
+    @abstractmethod
+    def collect_garbage(self) -> int:
+        """Drop results from old snapshots, returning the number removed."""
+
+
+class SQLiteResultStore(ResultStore):
+    """
+    SQLite-backed store in WAL mode, so readers on other threads or processes
+    are not blocked by a writer. Only the `keep_snapshots` most recent
+    snapshot versions are retained.
+    """
+
+    def __init__(self, path: str, keep_snapshots: int = 2):
+        self.path = path
+        self.keep_snapshots = keep_snapshots
+        self._local = threading.local()
+        self._latest_snapshot: str | None = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads; one per thread
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT NOT NULL,
+                    snapshot TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (key, snapshot)
+                )
+                """
+            )
+            connection.commit()
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str, snapshot: str) -> dict[str, Any] | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT payload FROM results WHERE key = ? AND snapshot = ?",
+                (key, snapshot),
+            )
+            .fetchone()
+        )
+        return json.loads(row[0]) if row else None
+
+    def get_latest(self, key: str) -> tuple[str, dict[str, Any]] | None:
+        row = (
+            self._connection()
+            .execute(
+                "SELECT snapshot, payload FROM results WHERE key = ? "
+                "ORDER BY snapshot DESC LIMIT 1",
+                (key,),
+            )
+            .fetchone()
+        )
+        return (row[0], json.loads(row[1])) if row else None
+
+    def put(self, key: str, snapshot: str, result: dict[str, Any]) -> None:
+        payload = json.dumps(result, default=_to_json_value)
+        connection = self._connection()
+        with connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+                (key, snapshot, payload, time.time()),
+            )
+
+        # A new snapshot version means older ones can be dropped
+        if self._latest_snapshot is None or snapshot > self._latest_snapshot:
+            self._latest_snapshot = snapshot
+            removed = self.collect_garbage()
+            if removed:
+                logger.info("Removed %d results from old data snapshots", removed)
+
+    def collect_garbage(self) -> int:
+        connection = self._connection()
+        with connection:
+            cursor = connection.execute(
+                """
+                DELETE FROM results WHERE snapshot NOT IN (
+                    SELECT DISTINCT snapshot FROM results
+                    ORDER BY snapshot DESC LIMIT ?
+                )
+                """,
+                (self.keep_snapshots,),
+            )
+        return cursor.rowcount
+
+
+result_store: ResultStore = SQLiteResultStore(
+    settings.RESULT_STORE_PATH, settings.RESULT_STORE_KEEP_SNAPSHOTS
+)
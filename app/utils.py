@@ -1,19 +1,152 @@
+import hashlib
 import json
+import logging
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
 from datetime import datetime, timedelta
+from functools import lru_cache
 
 import cvxpy as cp
 import numpy as np
 import yfinance as yf
 from fastapi import HTTPException
+from scipy.cluster.hierarchy import leaves_list, linkage
+from scipy.optimize import minimize
+from scipy.spatial.distance import squareform
 from scipy.stats import norm
 
+from app.core.config import settings
 from app.models import InvestmentHorizon, Objective, QuestionnaireResponse
+from app.rolling_stats import IncrementalStatistics
+from app.solvers import SolverPolicy
+from app.store import make_result_key, result_store
 
 #read tickers from environment variable
 
 TICKERS = json.loads(os.getenv('TICKERS'))
 
+# Stored results are only valid for the ticker universe they were computed on
+TICKERS_VERSION = hashlib.sha256(json.dumps(TICKERS).encode()).hexdigest()[:16]
+
+logger = logging.getLogger(__name__)
+
+
+# Rolling mean/covariance per investment term, advanced as trading days arrive
+statistics_engine = IncrementalStatistics()
+
+
+@lru_cache(maxsize=16)
+def _load_market_data(investment_term: int, start_date: str, end_date: str):
+    data = yf.download(TICKERS, start=start_date, end=end_date)["Adj Close"]
+
+    # Raising keeps failed downloads out of the cache
+    if data.empty:
+        raise HTTPException(
+            status_code=400, detail="No data fetched for the given investment term."
+        )
+
+    # Calculate daily returns, expected returns, and covariance matrix
+    returns = data.pct_change().dropna()
+    expected_returns, covariance_matrix = statistics_engine.update(
+        investment_term, returns
+    )
+    return data, returns, expected_returns, covariance_matrix
+
+
+def market_data_snapshot() -> str:
+    # Market data is fetched up to today, so the date identifies the snapshot
+    return datetime.now().strftime("%Y-%m-%d")
+
+
+def get_market_data(investment_term: int):
+    """
+    Return (prices, daily returns, expected returns, covariance matrix) for
+    TICKERS over the last `investment_term` days. Results are cached per
+    date range, so repeated requests on the same day share one download and
+    one set of statistics. Callers must not mutate the returned frames.
+    """
+    end_date = datetime.strptime(market_data_snapshot(), "%Y-%m-%d")
+    start_date = end_date - timedelta(days=investment_term)
+    return _load_market_data(
+        investment_term, start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    )
+
+
+# Computations that outlived their request deadline, keyed by (key, snapshot)
+_background_executor = ThreadPoolExecutor(
+    max_workers=settings.RESULT_WORKERS, thread_name_prefix="result"
+)
+_in_flight: dict[tuple[str, str], Future] = {}
+_in_flight_lock = threading.Lock()
+
+
+def _compute_and_store(key: str, snapshot: str, compute) -> Future:
+    # One computation per key and snapshot, shared by concurrent requests
+    with _in_flight_lock:
+        future = _in_flight.get((key, snapshot))
+        if future is not None:
+            return future
+
+        def run():
+            result = compute()
+            result_store.put(key, snapshot, result)
+            return result
+
+        def finished(future: Future):
+            with _in_flight_lock:
+                _in_flight.pop((key, snapshot), None)
+            if future.exception() is not None:
+                logger.warning("Computation for %s failed: %s", key, future.exception())
+
+        future = _background_executor.submit(run)
+        _in_flight[(key, snapshot)] = future
+    future.add_done_callback(finished)
+    return future
+
+
+def cached_result(kind: str, params: dict, compute, deadline: float | None = None):
+    """
+    Serve `compute()` from the result store when the same parameters were
+    already computed for the current ticker universe and market data
+    snapshot, otherwise compute and persist it for other requests, replicas
+    and restarts.
+
+    With a `deadline` (seconds), a computation that runs over it keeps going in
+    the background and fills the store, while the request gets the latest
+    stored result for the same parameters with "stale": True. If nothing has
+    been stored yet, the request waits for the computation.
+    """
+    key = make_result_key(kind, {**params, "tickers": TICKERS_VERSION})
+    snapshot = market_data_snapshot()
+
+    result = result_store.get(key, snapshot)
+    if result is not None:
+        return {**result, "stale": False}
+
+    if not deadline:
+        result = compute()
+        result_store.put(key, snapshot, result)
+        return {**result, "stale": False}
+
+    future = _compute_and_store(key, snapshot, compute)
+    try:
+        return {**future.result(timeout=deadline), "stale": False}
+    except TimeoutError:
+        latest = result_store.get_latest(key)
+        if latest is None:
+            return {**future.result(), "stale": False}
+        stale_snapshot, result = latest
+        logger.warning(
+            "Deadline of %.1fs exceeded for %s, serving snapshot %s",
+            deadline,
+            key,
+            stale_snapshot,
+        )
+        return {**result, "stale": True, "snapshot": stale_snapshot}
+
+
 def calculate_risk_score(response: QuestionnaireResponse) -> int:
     risk_score = 0
 
@@ -60,9 +193,110 @@ def map_score_to_risk_level(risk_score: int) -> float:
     return round(risk_level, 2)
 
 
-def optimize_portfolio_assets(
-    expected_returns,
-    covariance_matrix,
+def inverse_volatility_weights(covariance_matrix) -> np.ndarray:
+    # Weight each asset by 1 / volatility, ignoring correlations
+    volatilities = np.sqrt(np.clip(np.diag(covariance_matrix.values), 1e-16, None))
+    inverse_volatilities = 1 / volatilities
+    return inverse_volatilities / inverse_volatilities.sum()
+
+
+def _cluster_variance(covariance: np.ndarray, start: int, stop: int) -> float:
+    # Variance of an inverse-variance weighted cluster of contiguous assets
+    cluster_covariance = covariance[start:stop, start:stop]
+    inverse_variances = 1 / np.clip(np.diag(cluster_covariance), 1e-16, None)
+    cluster_weights = inverse_variances / inverse_variances.sum()
+    return float(cluster_weights @ cluster_covariance @ cluster_weights)
+
+
+def hierarchical_risk_parity_weights(covariance_matrix) -> np.ndarray:
+    """
+    Hierarchical Risk Parity (Lopez de Prado): cluster assets on the
+    correlation distance, reorder the covariance matrix so similar assets are
+    adjacent, then split the risk budget top-down between the two halves of
+    each cluster in inverse proportion to their variance.
+    """
+    covariance = covariance_matrix.values
+    n_assets = len(covariance)
+    if n_assets == 1:
+        return np.ones(1)
+
+    volatilities = np.sqrt(np.clip(np.diag(covariance), 1e-16, None))
+    correlation = np.clip(covariance / np.outer(volatilities, volatilities), -1, 1)
+    distance = np.sqrt(0.5 * (1 - correlation))
+    np.fill_diagonal(distance, 0)
+
+    # Quasi-diagonalize: the leaf order of the dendrogram keeps clusters contiguous
+    order = leaves_list(linkage(squareform(distance, checks=False), method="single"))
+    sorted_covariance = covariance[np.ix_(order, order)]
+
+    # Recursive bisection over contiguous index ranges of the sorted matrix
+    sorted_weights = np.ones(n_assets)
+    clusters = [(0, n_assets)]
+    while clusters:
+        next_clusters = []
+        for start, stop in clusters:
+            if stop - start < 2:
+                continue
+            middle = (start + stop) // 2
+            left_variance = _cluster_variance(sorted_covariance, start, middle)
+            right_variance = _cluster_variance(sorted_covariance, middle, stop)
+            alpha = 1 - left_variance / (left_variance + right_variance)
+            sorted_weights[start:middle] *= alpha
+            sorted_weights[middle:stop] *= 1 - alpha
+            next_clusters += [(start, middle), (middle, stop)]
+        clusters = next_clusters
+
+    weights = np.empty(n_assets)
+    weights[order] = sorted_weights
+    return weights / weights.sum()
+
+
+def equal_risk_contribution_weights(
+    covariance_matrix, tolerance: float = 1e-10, max_iterations: int = 10000
+) -> np.ndarray:
+    """
+    Equal Risk Contribution weights, where every asset contributes the same
+    share of portfolio variance. Solves the convex formulation
+    min 1/2 y'Cy - sum(log(y)) (Spinu, 2013) on the correlation matrix C with
+    L-BFGS in log space, so each iteration costs one O(n^2) matrix-vector
+    product; dividing y by the volatilities and normalizing gives the weights.
+    """
+    covariance = covariance_matrix.values
+    n_assets = len(covariance)
+    volatilities = np.sqrt(np.clip(np.diag(covariance), 1e-16, None))
+    correlation = covariance / np.outer(volatilities, volatilities)
+
+    def objective_and_gradient(log_y):
+        y = np.exp(log_y)
+        correlation_y = correlation @ y
+        return 0.5 * y @ correlation_y - log_y.sum(), y * correlation_y - 1
+
+    # Start from equal risk in correlation space, scaled so that y'Cy = n
+    y = np.ones(n_assets)
+    y *= np.sqrt(n_assets / (y @ correlation @ y))
+
+    result = minimize(
+        objective_and_gradient,
+        np.log(y),
+        jac=True,
+        method="L-BFGS-B",
+        options={"gtol": tolerance, "ftol": 0, "maxiter": max_iterations},
+    )
+    weights = np.exp(result.x) / volatilities
+    return weights / weights.sum()
+
+
+# Solver-free objectives: allocation is computed directly from the covariance
+RISK_PARITY_ALLOCATORS = {
+    Objective.hierarchical_risk_parity: hierarchical_risk_parity_weights,
+    Objective.inverse_volatility: inverse_volatility_weights,
+    Objective.equal_risk_contribution: equal_risk_contribution_weights,
+}
+
+
+def _build_portfolio_problem(
+    expected_returns: np.ndarray,
+    covariance_matrix: np.ndarray,
     objective,
     target_return=None,
     risk_limit=None,
@@ -71,9 +305,9 @@ def optimize_portfolio_assets(
     weights = cp.Variable(n_assets)
 
     # Define risk and return expressions
-    portfolio_return = expected_returns.values @ weights *252
+    portfolio_return = expected_returns @ weights *252
 
-    portfolio_risk = 252 * cp.quad_form(weights, covariance_matrix.values)
+    portfolio_risk = 252 * cp.quad_form(weights, covariance_matrix)
 
     # Constraints: Weights sum to 1, no short selling
     constraints = [cp.sum(weights) == 1, weights >= 0]
@@ -110,19 +344,210 @@ def optimize_portfolio_assets(
     else:
         raise ValueError("Invalid optimization objective.")
 
-    # Solve the optimization problem
     prob = cp.Problem(objective_function, constraints)
-    prob.solve()
+    return prob, weights, portfolio_return, portfolio_risk
+
+
+def _benchmark_problem(objective):
+    # Synthetic one-factor market the size of our universe, for solver autotuning
+    rng = np.random.default_rng(0)
+    n_assets = len(TICKERS)
+    betas = rng.uniform(0.5, 1.5, n_assets)
+    covariance_matrix = 0.01**2 * np.outer(betas, betas) + np.diag(
+        rng.uniform(0.005, 0.02, n_assets) ** 2
+    )
+    expected_returns = rng.normal(0.0004, 0.0003, n_assets)
+
+    # Equal weights are feasible for both constrained objectives
+    equal_weights = np.full(n_assets, 1 / n_assets)
+    prob, weights, _, _ = _build_portfolio_problem(
+        expected_returns,
+        covariance_matrix,
+        objective,
+        target_return=252 * float(expected_returns @ equal_weights),
+        risk_limit=252 * float(equal_weights @ covariance_matrix @ equal_weights),
+    )
+    return prob, weights
 
-    # Check if the optimization was successful
-    if prob.status not in ["optimal", "optimal_inaccurate"]:
-        raise ValueError(f"Optimization failed. Status: {prob.status}")
+
+solver_policy = SolverPolicy(
+    _benchmark_problem,
+    settings.SOLVER_CANDIDATES,
+    autotune=settings.SOLVER_AUTOTUNE,
+    accuracy=settings.SOLVER_ACCURACY,
+)
+
+
+def optimize_portfolio_assets(
+    expected_returns,
+    covariance_matrix,
+    objective,
+    target_return=None,
+    risk_limit=None,
+):
+    """
+    Returns (weights, value, solve_info): the optimal weights, the annualized
+    return (max_return_with_risk) or variance (other objectives), and a record
+    of the solver used and its solve time.
+    """
+    if objective in RISK_PARITY_ALLOCATORS:
+        started = time.perf_counter()
+        optimal_weights = RISK_PARITY_ALLOCATORS[objective](covariance_matrix)
+        elapsed = time.perf_counter() - started
+        portfolio_risk = 252 * float(
+            optimal_weights @ covariance_matrix.values @ optimal_weights
+        )
+        solve_info = {
+            "solver": Objective(objective).value,
+            "status": "optimal",
+            "solve_time_ms": round(elapsed * 1000, 2),
+            "attempts": [],
+        }
+        return optimal_weights, portfolio_risk, solve_info
+
+    prob, weights, portfolio_return, portfolio_risk = _build_portfolio_problem(
+        expected_returns.values,
+        covariance_matrix.values,
+        objective,
+        target_return,
+        risk_limit,
+    )
+
+    # Solve with the ranked solvers for this objective, falling back on failure
+    solve_info = solver_policy.solve(prob, Objective(objective))
 
     optimal_weights = weights.value
     if objective == Objective.max_return_with_risk:
-        return optimal_weights, portfolio_return.value
+        return optimal_weights, portfolio_return.value, solve_info
     else:
-        return optimal_weights, portfolio_risk.value
+        return optimal_weights, portfolio_risk.value, solve_info
+
+def _active_sets(pool: np.ndarray, size: int):
+    # The top `size` positions of the pool first, then sets that keep fewer of
+    # the top positions and fill the rest from the next-ranked ones
+    yield pool[:size]
+    for kept in range(size - 1, -1, -1):
+        for start in range(kept + 1, len(pool) - (size - kept) + 1):
+            yield np.concatenate([pool[:kept], pool[start : start + size - kept]])
+
+
+def optimize_sparse_portfolio(
+    expected_returns,
+    covariance_matrix,
+    objective,
+    target_return=None,
+    risk_limit=None,
+    max_holdings=None,
+    min_position=None,
+):
+    """
+    Heuristic cardinality-constrained optimization: at most `max_holdings`
+    positions, each at least `min_position` (as decimal).
+
+    Solves the dense problem once and screens its largest positions into a
+    pool of at most twice the holdings cap. The reduced problem is built once
+    over that pool, with a parameter bounding the weights outside the active
+    set to zero, so every later solve re-uses the solver's cached
+    factorization and previous solution as a warm start. It is solved on the
+    top positions first; positions below `min_position` are dropped and the
+    problem re-solved until every remaining position meets it. When the risk
+    limit or target return cannot be met, positions are swapped in from the
+    next-ranked ones until an active set works; ValueError if none does.
+
+    Returns (weights, value, solve_info, dense) where dense is the
+    unconstrained (weights, value, solve_info) for comparison.
+    """
+    dense_weights, dense_value, dense_info = optimize_portfolio_assets(
+        expected_returns, covariance_matrix, objective, target_return, risk_limit
+    )
+    n_assets = len(dense_weights)
+
+    # Screening: the largest dense positions form the pool. A minimum position
+    # size also caps the number of holdings at 1 / min_position.
+    holdings_cap = n_assets if max_holdings is None else max_holdings
+    if min_position is not None:
+        holdings_cap = min(holdings_cap, max(1, int(1 / min_position)))
+    ranked = np.argsort(-dense_weights, kind="stable")
+    n_dense_holdings = int(np.sum(dense_weights > 1e-6))
+    pool = ranked[: min(max(n_dense_holdings, holdings_cap), 2 * holdings_cap)]
+
+    if objective in RISK_PARITY_ALLOCATORS:
+        # No constraints to violate; recompute the allocation on the active set
+        def solve_active(active):
+            active_weights, value, solve_info = optimize_portfolio_assets(
+                expected_returns.iloc[active],
+                covariance_matrix.iloc[active, active],
+                objective,
+            )
+            return active_weights, value, solve_info
+
+    else:
+        prob, weights, portfolio_return, portfolio_risk = _build_portfolio_problem(
+            expected_returns.values[pool],
+            covariance_matrix.values[np.ix_(pool, pool)],
+            objective,
+            target_return,
+            risk_limit,
+        )
+        upper_bounds = cp.Parameter(len(pool), nonneg=True)
+        prob = cp.Problem(prob.objective, [*prob.constraints, weights <= upper_bounds])
+
+        def solve_active(active):
+            upper_bounds.value = np.isin(pool, active).astype(float)
+            try:
+                solve_info = solver_policy.solve(
+                    prob, Objective(objective), warm_start=True
+                )
+            except ValueError:
+                if prob.status in [cp.INFEASIBLE, cp.INFEASIBLE_INACCURATE]:
+                    return None
+                raise
+            pool_weights = dict(zip(pool, weights.value))
+            active_weights = np.array([pool_weights[asset] for asset in active])
+            if objective == Objective.max_return_with_risk:
+                return active_weights, portfolio_return.value, solve_info
+            return active_weights, portfolio_risk.value, solve_info
+
+    reduced_solves = 0
+    started = time.perf_counter()
+    for candidate in _active_sets(pool, min(holdings_cap, len(pool))):
+        active = candidate
+        while True:
+            reduced_solves += 1
+            result = solve_active(active)
+            if result is None:
+                break
+            active_weights, value, solve_info = result
+
+            below_minimum = active_weights < (min_position or 0) - 1e-9
+            if not below_minimum.any() or below_minimum.all():
+                break
+            active = active[~below_minimum]
+        if result is not None:
+            break
+    else:
+        limit = (
+            f"risk limit of {risk_limit}"
+            if objective == Objective.max_return_with_risk
+            else f"target return of {target_return}"
+        )
+        raise ValueError(
+            f"The holdings and minimum position limits cannot meet the {limit}: "
+            f"no screened set of up to {holdings_cap} holdings is feasible."
+        )
+
+    weights = np.zeros(n_assets)
+    weights[active] = np.clip(active_weights, 0, None)
+    weights /= weights.sum()
+
+    solve_info = {
+        **solve_info,
+        "solve_time_ms": round((time.perf_counter() - started) * 1000, 2),
+        "reduced_solves": reduced_solves,
+        "active_set_size": len(active),
+    }
+    return weights, value, solve_info, (dense_weights, dense_value, dense_info)
+
 
 def optimize_portfolio_levels(
     expected_returns,
@@ -165,11 +590,7 @@ def optimize_portfolio_levels(
 
     # Solve the optimization problem
     prob = cp.Problem(objective_function, constraints)
-    prob.solve()
-
-    # Check if the optimization was successful
-    if prob.status not in ["optimal", "optimal_inaccurate"]:
-        raise ValueError(f"Optimization failed. Status: {prob.status}")
+    solver_policy.solve(prob, Objective(objective))
 
     optimal_weights = weights.value
     #return maximized return and minimized risk
@@ -180,37 +601,143 @@ def optimize_portfolio_levels(
 
 
 
-def optimize_portfolio_with_risk_level(risk_level: float, investment_term: int):
-    # Set the objective based on risk level
-    if risk_level < 0.33:
-        objective = Objective.min_risk
-    elif risk_level < 0.66:
-        objective = Objective.max_sharpe
-    else:
-        objective = Objective.max_return
+def evaluate_portfolio_risk(
+    weights,
+    expected_returns,
+    covariance_matrix,
+    returns,
+    confidence_levels,
+):
+    """
+    Risk analytics for one or more fixed portfolios, without any solver.
+    `weights` is a (portfolios x assets) matrix; every statistic is computed
+    for all portfolios at once with matrix products.
+
+    Returns a dict of arrays (daily units, not percentages):
+    - expected_return (k,), risk (k,)
+    - parametric_var (k, levels), historical_var (k, levels)
+    - marginal_risk (k, assets), component_risk (k, assets)
+    """
+    weights = np.atleast_2d(np.asarray(weights, dtype=float))
+    confidence_levels = np.asarray(confidence_levels, dtype=float)
+
+    # W @ mu and the row-wise quadratic forms W Σ W'
+    expected_return = weights @ expected_returns.values
+    covariance_products = weights @ covariance_matrix.values
+    risk = np.sqrt(np.einsum("ij,ij->i", covariance_products, weights))
+
+    # Parametric VaR for every (portfolio, confidence level) pair
+    z_scores = norm.ppf(confidence_levels)
+    parametric_var = np.outer(risk, z_scores) - expected_return[:, None]
+
+    # Historical VaR from the portfolio return series, one quantile call
+    portfolio_returns = returns.values @ weights.T
+    historical_var = -np.percentile(
+        portfolio_returns, (1 - confidence_levels) * 100, axis=0
+    ).T
+
+    # Marginal contribution d(risk)/d(w) and its weighted (Euler) split
+    safe_risk = np.where(risk > 0, risk, 1)[:, None]
+    marginal_risk = covariance_products / safe_risk
+    component_risk = weights * marginal_risk
 
-    # Fetch historical data based on investment term
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=investment_term)
-    data = yf.download(
-        TICKERS,
-        start=start_date.strftime("%Y-%m-%d"),
-        end=end_date.strftime("%Y-%m-%d"),
-    )["Adj Close"]
+    return {
+        "expected_return": expected_return,
+        "risk": risk,
+        "parametric_var": parametric_var,
+        "historical_var": historical_var,
+        "marginal_risk": marginal_risk,
+        "component_risk": component_risk,
+    }
 
-    if data.empty:
-        raise HTTPException(
-            status_code=400, detail="No data fetched for the given investment term."
-        )
 
-    # Calculate daily returns, expected returns, and covariance matrix
-    returns = data.pct_change().dropna()
-    expected_returns = returns.mean()
-    covariance_matrix = returns.cov()
+DEFAULT_SURFACE_CONFIDENCE_LEVELS = [round(0.90 + 0.01 * i, 2) for i in range(10)]
+DEFAULT_SURFACE_HORIZONS = [1, 5, 21, 252]
+
+
+def compute_risk_surface(
+    portfolio_returns,
+    daily_expected_return: float,
+    daily_expected_risk: float,
+    confidence_levels,
+    horizons,
+):
+    """
+    Parametric VaR, historical VaR and historical expected shortfall for every
+    (confidence level, horizon) pair, as (levels x horizons) arrays in daily
+    return units scaled by sqrt(horizon).
+
+    The return series is sorted once; all historical quantiles are then read
+    from it with the same linear interpolation as np.percentile, and the
+    expected shortfalls come from a single cumulative sum, so the grid costs
+    about the same as one VaR point.
+    """
+    sorted_returns = np.sort(np.asarray(portfolio_returns, dtype=float))
+    n_observations = len(sorted_returns)
+    tail_probabilities = 1 - np.asarray(confidence_levels, dtype=float)
+    horizon_scaling = np.sqrt(np.asarray(horizons, dtype=float))
+
+    # Vectorized quantiles on the sorted series
+    positions = tail_probabilities * (n_observations - 1)
+    lower = np.floor(positions).astype(int)
+    upper = np.minimum(lower + 1, n_observations - 1)
+    fraction = positions - lower
+    quantiles = sorted_returns[lower] * (1 - fraction) + sorted_returns[upper] * fraction
+
+    # Expected shortfall: mean of the returns at or below each quantile
+    tail_counts = np.maximum(np.searchsorted(sorted_returns, quantiles, side="right"), 1)
+    expected_shortfall = -np.cumsum(sorted_returns)[tail_counts - 1] / tail_counts
+
+    z_scores = norm.ppf(confidence_levels)
+    parametric_var = z_scores * daily_expected_risk - daily_expected_return
+
+    return {
+        "parametric_var": np.outer(parametric_var, horizon_scaling),
+        "historical_var": np.outer(-quantiles, horizon_scaling),
+        "expected_shortfall": np.outer(expected_shortfall, horizon_scaling),
+    }
+
+
+def optimize_portfolio_with_risk_level(
+    risk_level: float,
+    investment_term: int,
+    objective: Objective | None = None,
+    deadline: float | None = settings.QUESTIONNAIRE_DEADLINE_SECONDS,
+):
+    # Set the objective based on risk level, unless one was requested explicitly
+    if objective is None:
+        if risk_level < 0.33:
+            objective = Objective.min_risk
+        elif risk_level < 0.66:
+            objective = Objective.max_sharpe
+        else:
+            objective = Objective.max_return
+
+    return cached_result(
+        "risk_level",
+        {
+            "risk_level": risk_level,
+            "investment_term": investment_term,
+            "objective": objective,
+        },
+        lambda: _optimize_portfolio_with_objective(
+            risk_level, investment_term, objective
+        ),
+        deadline=deadline,
+    )
+
+
+def _optimize_portfolio_with_objective(
+    risk_level: float, investment_term: int, objective: Objective
+):
+    # Fetch historical data and statistics based on investment term
+    data, returns, expected_returns, covariance_matrix = get_market_data(
+        investment_term
+    )
 
     # Optimize the portfolio
     try:
-        allocation,result = optimize_portfolio_assets(
+        allocation, result, solve_info = optimize_portfolio_assets(
             expected_returns, covariance_matrix, objective, risk_limit=risk_level
         )
     except ValueError as e:
@@ -292,6 +819,7 @@ def optimize_portfolio_with_risk_level(risk_level: float, investment_term: int):
             "expected_annual_return": round(expected_portfolio_return * 100, 2),
             "expected_annual_risk": round(expected_portfolio_risk * 100, 2),
             "confidence_level": confidence_level,
+            "solver": solve_info,
             "value_at_risk": {
                 "daily_var": round(daily_var * 100, 2),
                 "weekly_var": round(weekly_var * 100, 2),
@@ -0,0 +1,335 @@
+"""
+Load test for the portfolio API with a synthetic market data source.
+
+Sends a mix of /questionnaire, /calculator and /optimize traffic at a sweep of
+concurrency levels and reports throughput, p50/p95/p99 latency and error rate
+per endpoint, plus the concurrency level at which throughput saturates.
+In-process, every level starts from an empty result store and market data
+cache and the store hit rate is reported; --shared-store keeps one store
+across the sweep instead.
+
+In-process (ASGI app, yfinance replaced by synthetic prices):
+
+    python scripts/load_test.py --concurrency 1,2,4,8,16,32 --duration 10
+
+Against a local uvicorn serving the same stubbed app:
+
+    uvicorn load_test:create_app --factory --app-dir scripts --port 8080
+    python scripts/load_test.py --url http://localhost:8080
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import defaultdict
+
+import httpx
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+DEFAULT_MIX = "questionnaire=0.4,calculator=0.3,optimize=0.3"
+
+
+def synthetic_download(tickers, start=None, end=None, latency: float = 0.0, **kwargs):
+    """
+    Stand-in for yf.download: correlated geometric random walks on business
+    days, deterministic for a given ticker list and date range.
+    """
+    if latency:
+        time.sleep(latency)
+    dates = pd.bdate_range(start, end)
+    rng = np.random.default_rng(zlib.crc32(f"{list(tickers)}{start}{end}".encode()))
+    market = rng.normal(0.0003, 0.008, size=(len(dates), 1))
+    idiosyncratic = rng.normal(0.0002, 0.012, size=(len(dates), len(tickers)))
+    betas = rng.uniform(0.5, 1.5, size=len(tickers))
+    prices = 100 * np.exp(np.cumsum(market * betas + idiosyncratic, axis=0))
+    columns = pd.MultiIndex.from_product([["Adj Close"], tickers])
+    return pd.DataFrame(prices, index=dates, columns=columns)
+
+
+def create_app(n_tickers: int | None = None, data_latency: float | None = None):
+    """
+    Build the FastAPI app with yfinance stubbed out. Environment variables
+    LOAD_TEST_TICKERS and LOAD_TEST_DATA_LATENCY configure the uvicorn factory.
+    """
+    n_tickers = n_tickers or int(os.getenv("LOAD_TEST_TICKERS", "20"))
+    if data_latency is None:
+        data_latency = float(os.getenv("LOAD_TEST_DATA_LATENCY", "0"))
+
+    # Settings are read at import time, so configure the environment first
+    os.environ["TICKERS"] = json.dumps([f"SYN{i:03d}" for i in range(n_tickers)])
+    os.environ.setdefault("PROJECT_NAME", "load-test")
+    os.environ.setdefault(
+        "RESULT_STORE_PATH", os.path.join(tempfile.mkdtemp(), "results.sqlite3")
+    )
+
+    import yfinance as yf
+
+    yf.download = lambda *args, **kwargs: synthetic_download(
+        *args, latency=data_latency, **kwargs
+    )
+
+    from app.main import app
+
+    return app
+
+
+class CountingStore:
+    """Wraps the app's result store, counting lookups that find a result."""
+
+    def __init__(self, store):
+        self.store = store
+        self.hits = 0
+        self.lookups = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, snapshot):
+        result = self.store.get(key, snapshot)
+        with self._lock:
+            self.lookups += 1
+            self.hits += result is not None
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.store, name)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.hits = self.lookups = 0
+
+
+def reset_app_state(fresh_store: bool) -> CountingStore:
+    """
+    Point the app at a counting (and, with `fresh_store`, empty) result store
+    and drop cached market data, so the next level starts cold.
+    """
+    import app.utils
+    from app.core.config import settings
+    from app.store import SQLiteResultStore
+
+    store = app.utils.result_store
+    if isinstance(store, CountingStore):
+        store = store.store
+    if fresh_store:
+        store = SQLiteResultStore(
+            os.path.join(tempfile.mkdtemp(), "results.sqlite3"),
+            settings.RESULT_STORE_KEEP_SNAPSHOTS,
+        )
+        app.utils._load_market_data.cache_clear()
+    app.utils.result_store = CountingStore(store)
+    return app.utils.result_store
+
+
+def make_request(
+    rng: random.Random, mix: dict[str, float]
+) -> tuple[str, str, str, dict]:
+    """Return (endpoint, method, path, request kwargs) for one request of the mix."""
+    from app.models import (
+        AgeGroup,
+        InvestmentGoal,
+        InvestmentHorizon,
+        LossReaction,
+        Objective,
+    )
+
+    endpoint = rng.choices(list(mix), weights=list(mix.values()))[0]
+    if endpoint == "questionnaire":
+        body = {
+            "age_group": rng.choice(list(AgeGroup)).value,
+            "investment_goal": rng.choice(list(InvestmentGoal)).value,
+            "loss_reaction": rng.choice(list(LossReaction)).value,
+            "investment_horizon": rng.choice(list(InvestmentHorizon)).value,
+        }
+        return endpoint, "POST", "/questionnaire", {"json": body}
+
+    investment_term = rng.choice([365, 1095, 1825, 3650])
+    if endpoint == "calculator":
+        # Continuous targets, so most calculator requests miss the result store
+        if rng.random() < 0.5:
+            params = {"target_return": round(rng.uniform(0.02, 0.15), 4)}
+        else:
+            params = {"risk_limit": round(rng.uniform(0.01, 0.2), 4)}
+        params["investment_term"] = investment_term
+        return endpoint, "POST", "/calculator", {"params": params}
+
+    objective = rng.choice(
+        [
+            Objective.max_return,
+            Objective.min_risk,
+            Objective.max_sharpe,
+            Objective.hierarchical_risk_parity,
+            Objective.inverse_volatility,
+            Objective.equal_risk_contribution,
+        ]
+    )
+    params = {
+        "investment_term": investment_term,
+        "objective": objective.value,
+        "confidence_level": rng.choice([0.9, 0.95, 0.99]),
+    }
+    return endpoint, "GET", "/optimize", {"params": params}
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    prefix: str,
+    mix: dict[str, float],
+    concurrency: int,
+    duration: float,
+    seed: int,
+) -> dict:
+    latencies: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int) -> None:
+        rng = random.Random(seed * 1000 + worker_id)
+        while time.perf_counter() < deadline:
+            endpoint, method, path, kwargs = make_request(rng, mix)
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, prefix + path, **kwargs)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies[endpoint].append(time.perf_counter() - started)
+            if failed:
+                errors[endpoint] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    for endpoint in [*mix, "all"]:
+        if endpoint == "all":
+            samples = [x for values in latencies.values() for x in values]
+            failures = sum(errors.values())
+        else:
+            samples = latencies[endpoint]
+            failures = errors[endpoint]
+        if not samples:
+            continue
+        p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+        report[endpoint] = {
+            "requests": len(samples),
+            "throughput": len(samples) / elapsed,
+            "p50_ms": p50,
+            "p95_ms": p95,
+            "p99_ms": p99,
+            "error_rate": failures / len(samples),
+        }
+    return report
+
+
+def find_saturation(results: list[tuple[int, dict]], min_gain: float) -> int | None:
+    # First level whose throughput gain over the previous level is below min_gain
+    for (_, previous), (concurrency, current) in zip(results, results[1:]):
+        if current["all"]["throughput"] < previous["all"]["throughput"] * (1 + min_gain):
+            return concurrency
+    return None
+
+
+def print_report(concurrency: int, report: dict, hit_rate: float | None = None) -> None:
+    print(f"\nconcurrency={concurrency}")
+    if hit_rate is not None:
+        print(f"  result store hit rate: {hit_rate:.1%}")
+    print(
+        f"  {'endpoint':<14}{'requests':>9}{'req/s':>9}"
+        f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>9}"
+    )
+    for endpoint, stats in report.items():
+        print(
+            f"  {endpoint:<14}{stats['requests']:>9}{stats['throughput']:>9.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+            f"{stats['error_rate']:>9.1%}"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.url:
+        transport = None
+        base_url = args.url
+        os.environ.setdefault("PROJECT_NAME", "load-test")
+    else:
+        app = create_app(args.tickers, args.data_latency)
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://load-test"
+
+    from app.core.config import settings
+
+    mix = parse_mix(args.mix)
+    levels = [int(level) for level in args.concurrency.split(",")]
+    results = []
+    store = None
+    async with httpx.AsyncClient(
+        transport=transport, base_url=base_url, timeout=args.timeout
+    ) as client:
+        for concurrency in levels:
+            if transport is not None:
+                if store is None or not args.shared_store:
+                    store = reset_app_state(fresh_store=not args.shared_store)
+                store.reset()
+            report = await run_level(
+                client, settings.API_V1_STR, mix, concurrency, args.duration, args.seed
+            )
+            hit_rate = None
+            if store is not None and store.lookups:
+                hit_rate = store.hits / store.lookups
+            print_report(concurrency, report, hit_rate)
+            if "all" in report:
+                if hit_rate is not None:
+                    report["all"]["result_store_hit_rate"] = hit_rate
+                results.append((concurrency, report))
+
+    saturation = find_saturation(results, args.min_gain)
+    if saturation is None:
+        print("\nThroughput kept scaling; no saturation point within the sweep.")
+    else:
+        print(
+            f"\nSaturation at concurrency={saturation}: "
+            f"throughput grew less than {args.min_gain:.0%} over the previous level."
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({str(level): report for level, report in results}, f, indent=2)
+
+
+def parse_mix(value: str) -> dict[str, float]:
+    mix = {}
+    for item in value.split(","):
+        endpoint, weight = item.split("=")
+        mix[endpoint.strip()] = float(weight)
+    return mix
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process)")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds per level")
+    parser.add_argument("--mix", default=DEFAULT_MIX)
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument(
+        "--data-latency", type=float, default=0.0, help="Synthetic download delay (s)"
+    )
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--min-gain", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--shared-store",
+        action="store_true",
+        help="Keep one result store across levels (in-process only)",
+    )
+    parser.add_argument("--output", help="Write the full report as JSON")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,173 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.rolling_stats import IncrementalStatistics, RollingMoments
+
+
+def make_returns(n_days: int = 400, n_assets: int = 5, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.0005, 0.01, size=(n_days, n_assets))
+    return pd.DataFrame(
+        values,
+        index=pd.bdate_range("2020-01-01", periods=n_days),
+        columns=[f"A{i}" for i in range(n_assets)],
+    )
+
+
+def assert_matches(moments: RollingMoments, frame: pd.DataFrame) -> None:
+    assert moments.count == len(frame)
+    np.testing.assert_allclose(moments.mean, frame.mean().values, rtol=1e-10, atol=1e-14)
+    np.testing.assert_allclose(
+        moments.covariance(), frame.cov().values, rtol=1e-8, atol=1e-14
+    )
+
+
+def test_add_single_rows():
+    returns = make_returns(50)
+    moments = RollingMoments(returns.shape[1])
+    for row in returns.values:
+        moments.add(row)
+    assert_matches(moments, returns)
+
+
+def test_add_batches():
+    returns = make_returns(100)
+    moments = RollingMoments(returns.shape[1])
+    for start in range(0, 100, 30):
+        moments.add(returns.values[start : start + 30])
+    assert_matches(moments, returns)
+
+
+def test_remove_single_rows():
+    returns = make_returns(60)
+    moments = RollingMoments.from_array(returns.values)
+    for i in range(20):
+        moments.remove(returns.values[i])
+    assert_matches(moments, returns.iloc[20:])
+
+
+def test_remove_batches():
+    returns = make_returns(100)
+    moments = RollingMoments.from_array(returns.values)
+    moments.remove(returns.values[:25])
+    moments.remove(returns.values[25:40])
+    assert_matches(moments, returns.iloc[40:])
+
+
+def test_remove_everything_resets():
+    returns = make_returns(10)
+    moments = RollingMoments.from_array(returns.values)
+    moments.remove(returns.values)
+    assert moments.count == 0
+    moments.add(returns.values[:5])
+    assert_matches(moments, returns.iloc[:5])
+
+
+def test_sliding_window_stays_exact():
+    returns = make_returns(1000)
+    window = 250
+    moments = RollingMoments.from_array(returns.values[:window])
+    for start in range(1, len(returns) - window):
+        moments.remove(returns.values[start - 1 : start])
+        moments.add(returns.values[start + window - 1 : start + window])
+    assert_matches(moments, returns.iloc[start : start + window])
+
+
+def assert_statistics(result: tuple[pd.Series, pd.DataFrame], frame: pd.DataFrame):
+    expected_returns, covariance_matrix = result
+    pd.testing.assert_series_equal(expected_returns, frame.mean(), rtol=1e-10)
+    pd.testing.assert_frame_equal(covariance_matrix, frame.cov(), rtol=1e-8)
+
+
+def _from_array(cls, rows):
+    moments = cls(rows.shape[1])
+    moments.add(rows)
+    return moments
+
+
+def count_recomputes(monkeypatch) -> list[int]:
+    recomputes = []
+    monkeypatch.setattr(
+        RollingMoments,
+        "from_array",
+        classmethod(lambda cls, rows: recomputes.append(len(rows)) or _from_array(cls, rows)),
+    )
+    return recomputes
+
+
+@pytest.mark.parametrize("step", [1, 5, 20])
+def test_update_over_shifted_windows(step, monkeypatch):
+    returns = make_returns(800)
+    window = 250
+    engine = IncrementalStatistics()
+    recomputes = count_recomputes(monkeypatch)
+
+    for start in range(0, len(returns) - window, step):
+        frame = returns.iloc[start : start + window]
+        assert_statistics(engine.update("term", frame), frame)
+    # Only the first window is computed from scratch
+    assert recomputes == [window]
+
+
+def test_update_with_growing_and_shrinking_window():
+    returns = make_returns(300)
+    engine = IncrementalStatistics()
+    for start, end in [(0, 200), (0, 210), (5, 210), (10, 205), (12, 230)]:
+        frame = returns.iloc[start:end]
+        assert_statistics(engine.update("term", frame), frame)
+
+
+def test_recompute_on_changed_columns(monkeypatch):
+    returns = make_returns(300, n_assets=6)
+    engine = IncrementalStatistics()
+    engine.update("term", returns.iloc[:200, :5])
+    recomputes = count_recomputes(monkeypatch)
+
+    frame = returns.iloc[1:201]
+    assert_statistics(engine.update("term", frame), frame)
+    assert recomputes == [200]
+
+
+def test_recompute_on_revised_history(monkeypatch):
+    returns = make_returns(300)
+    engine = IncrementalStatistics()
+    engine.update("term", returns.iloc[:200])
+    recomputes = count_recomputes(monkeypatch)
+
+    revised = returns.copy()
+    revised.iloc[100, 2] += 0.05
+    frame = revised.iloc[1:201]
+    assert_statistics(engine.update("term", frame), frame)
+    assert recomputes == [200]
+
+
+def test_recompute_on_large_shift(monkeypatch):
+    returns = make_returns(500)
+    engine = IncrementalStatistics()
+    engine.update("term", returns.iloc[:200])
+    recomputes = count_recomputes(monkeypatch)
+
+    frame = returns.iloc[150:350]
+    assert_statistics(engine.update("term", frame), frame)
+    assert recomputes == [200]
+
+
+def test_windows_are_tracked_independently():
+    returns = make_returns(600)
+    engine = IncrementalStatistics()
+    for start in range(0, 50, 10):
+        short, long = returns.iloc[start : start + 100], returns.iloc[start : start + 400]
+        assert_statistics(engine.update(100, short), short)
+        assert_statistics(engine.update(400, long), long)
+
+
+def test_least_recently_updated_window_is_evicted():
+    returns = make_returns(100)
+    engine = IncrementalStatistics(maxsize=3)
+    for window in [1, 2, 3]:
+        engine.update(window, returns)
+    engine.update(1, returns)
+    engine.update(4, returns)
+
+    assert list(engine._windows) == [3, 1, 4]